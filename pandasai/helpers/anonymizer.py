@@ -9,6 +9,12 @@ import string
 
 import pandas as pd
 
+EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+PHONE_NUMBER_REGEX = re.compile(
+    r"\b(?:\+?\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4}\b"
+)
+CREDIT_CARD_REGEX = re.compile(r"^\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}$")
+
 
 class Anonymizer:
     def _is_valid_email(email: str) -> bool:
@@ -20,8 +26,7 @@ class Anonymizer:
         Returns (bool): True if the email is valid, otherwise False.
         """
 
-        email_regex = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return re.match(email_regex, email) is not None
+        return EMAIL_REGEX.match(email) is not None
 
     def _is_valid_phone_number(phone_number: str) -> bool:
         """Check if the given phone number is valid based on regex pattern.
@@ -32,8 +37,7 @@ class Anonymizer:
         Returns (bool): True if the phone number is valid, otherwise False.
         """
 
-        pattern = r"\b(?:\+?\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4}\b"
-        return re.search(pattern, phone_number) is not None
+        return PHONE_NUMBER_REGEX.search(phone_number) is not None
 
     def _is_valid_credit_card(credit_card_number: str) -> bool:
         """Check if the given credit card number is valid based on regex pattern.
@@ -44,8 +48,7 @@ class Anonymizer:
         Returns (str): True if the credit card number is valid, otherwise False.
         """
 
-        pattern = r"^\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}$"
-        return re.search(pattern, credit_card_number) is not None
+        return CREDIT_CARD_REGEX.search(credit_card_number) is not None
 
     def _generate_random_email() -> str:
         """Generates a random email address using predefined domains.
@@ -129,17 +132,20 @@ class Anonymizer:
         # for each column, check if it contains personal or sensitive information
         # and if so, replace the values with random values
         for col in df_head.columns:
-            if Anonymizer._is_valid_email(str(df_head[col].iloc[0])):
-                df_head[col] = df_head[col].apply(
-                    lambda x: Anonymizer._generate_random_email()
-                )
-            elif Anonymizer._is_valid_phone_number(str(df_head[col].iloc[0])):
-                df_head[col] = df_head[col].apply(
-                    lambda x: Anonymizer._generate_random_phone_number(str(x))
-                )
-            elif Anonymizer._is_valid_credit_card(str(df_head[col].iloc[0])):
-                df_head[col] = df_head[col].apply(
-                    lambda x: Anonymizer._generate_random_credit_card()
-                )
+            first_value = str(df_head[col].iloc[0])
+            if Anonymizer._is_valid_email(first_value):
+                df_head[col] = [
+                    Anonymizer._generate_random_email() for _ in range(len(df_head))
+                ]
+            elif Anonymizer._is_valid_phone_number(first_value):
+                df_head[col] = [
+                    Anonymizer._generate_random_phone_number(str(x))
+                    for x in df_head[col]
+                ]
+            elif Anonymizer._is_valid_credit_card(first_value):
+                df_head[col] = [
+                    Anonymizer._generate_random_credit_card()
+                    for _ in range(len(df_head))
+                ]
 
         return df_head
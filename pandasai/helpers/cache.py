@@ -2,6 +2,7 @@
 import glob
 import os
 import shelve
+from typing import Any
 from .path import find_project_root
 
 
@@ -13,6 +14,10 @@ class Cache:
         filename (str): filename to store the cache.
     """
 
+    # returned by `get` when the key is not in the cache, so that a miss can be
+    # told apart from a cached falsy value without reading the cache twice
+    MISSING = object()
+
     def __init__(self, filename="cache"):
         # define cache directory and create directory if it does not exist
         try:
@@ -35,17 +40,19 @@ class Cache:
 
         self.cache[key] = value
 
-    def get(self, key: str) -> str:
+    def get(self, key: str, default: Any = None) -> Any:
         """Get a value from the cache.
 
         Args:
             key (str): key to get the value from the cache.
+            default (Any, optional): value returned if the key is not in the
+                cache. Defaults to None.
 
         Returns:
-            str: value from the cache.
+            Any: value from the cache, or the default if the key is missing.
         """
 
-        return self.cache.get(key)
+        return self.cache.get(key, default)
 
     def delete(self, key: str) -> None:
         """Delete a key value pair from the cache.
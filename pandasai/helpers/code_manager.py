@@ -1,6 +1,8 @@
 import re
 import ast
-import astor
+import builtins
+import functools
+from types import CodeType
 import pandas as pd
 from .save_chart import add_save_chart
 from .optional import import_dependency
@@ -11,19 +13,38 @@ from ..constants import (
     WHITELISTED_LIBRARIES,
 )
 from ..middlewares.charts import ChartsMiddleware
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Tuple, FrozenSet
 from ..helpers.logger import Logger
 from ..helpers.df_config import Config
 import logging
 import traceback
 
 
+# Pattern to extract the missing name from a `NameError` message
+_NAME_ERROR_RE = re.compile(r"'([0-9a-zA-Z_]+)'")
+
+_WHITELISTED_BUILTINS = frozenset(WHITELISTED_BUILTINS)
+_WHITELISTED_LIBRARIES = frozenset(WHITELISTED_LIBRARIES)
+
+_IMPORT_TYPES = (ast.Import, ast.ImportFrom)
+
+# Builtins available to the executed code, built once and copied for each
+# execution: `exec` requires a real dict (e.g. to look up `__import__`), and the
+# copy prevents one execution from altering the builtins seen by the next
+_BUILTINS = {
+    **{builtin: getattr(builtins, builtin) for builtin in WHITELISTED_BUILTINS},
+    "__build_class__": builtins.__build_class__,
+    "__name__": "__main__",
+}
+
+
 class CodeManager:
     _dfs: List
-    _middlewares: List[Middleware] = [ChartsMiddleware()]
+    _middlewares: List[Middleware]
     _config: Config
     _logger: Logger = None
     _additional_dependencies: List[dict] = []
+    _dependencies_cache: dict
 
     _last_code_executed: str = None
 
@@ -42,7 +63,9 @@ class CodeManager:
         self._dfs = dfs
         self._config = config
         self._logger = logger
+        self._dependencies_cache = {}
 
+        self._middlewares = [ChartsMiddleware()]
         if self._config.middlewares is not None:
             self.add_middlewares(*self._config.middlewares)
 
@@ -77,13 +100,28 @@ class CodeManager:
             if " = analyze_data(" not in code:
                 code += "\n\nresult = analyze_data(dfs)"
 
-            exec(code, environment)
+            exec(self._compile_code(code), environment)
         except Exception as exc:
             self._logger.log("Error of executing code", level=logging.WARNING)
             self._logger.log(f"{traceback.format_exc()}", level=logging.DEBUG)
 
             return exc
 
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _compile_code(code: str) -> CodeType:
+        """
+        Compile the code to a code object. The result is memoized, so that
+        running the same code again (e.g. from the cache) skips compilation.
+
+        Args:
+            code (str): Python code.
+
+        Returns:
+            CodeType: The compiled code object.
+        """
+        return compile(code, "<string>", "exec")
+
     def _handle_error(
         self,
         exc: Exception,
@@ -112,11 +150,10 @@ class CodeManager:
             if hasattr(exc, "name"):
                 name_to_be_imported = exc.name
             elif exc.args and isinstance(exc.args[0], str):
-                name_ptrn = r"'([0-9a-zA-Z_]+)'"
-                if search_name_res := re.search(name_ptrn, exc.args[0]):
+                if search_name_res := _NAME_ERROR_RE.search(exc.args[0]):
                     name_to_be_imported = search_name_res.group(1)
 
-            if name_to_be_imported and name_to_be_imported in WHITELISTED_LIBRARIES:
+            if name_to_be_imported and name_to_be_imported in _WHITELISTED_LIBRARIES:
                 try:
                     package = import_dependency(name_to_be_imported)
                     environment[name_to_be_imported] = package
@@ -219,25 +256,24 @@ Code running:
         Returns (dict): A dictionary of environment variables
         """
 
-        dfs = self._get_original_dfs()
+        dependencies = {}
+        for lib in self._additional_dependencies:
+            module = self._dependencies_cache.get(lib["module"])
+            if module is None:
+                module = import_dependency(lib["module"])
+                self._dependencies_cache[lib["module"]] = module
+
+            dependencies[lib["alias"]] = getattr(module, lib["name"], module)
 
         return {
             "pd": pd,
-            "dfs": dfs,
-            **{
-                lib["alias"]: getattr(import_dependency(lib["module"]), lib["name"])
-                if hasattr(import_dependency(lib["module"]), lib["name"])
-                else import_dependency(lib["module"])
-                for lib in self._additional_dependencies
-            },
-            "__builtins__": {
-                **{builtin: __builtins__[builtin] for builtin in WHITELISTED_BUILTINS},
-                "__build_class__": __build_class__,
-                "__name__": "__main__",
-            },
+            "dfs": self._get_original_dfs(),
+            **dependencies,
+            "__builtins__": dict(_BUILTINS),
         }
 
-    def _is_jailbreak(self, node: ast.stmt) -> bool:
+    @staticmethod
+    def _is_jailbreak(node: ast.stmt) -> bool:
         """
         Remove jailbreaks from the code to prevent malicious code execution.
         Args:
@@ -255,7 +291,8 @@ Code running:
 
         return False
 
-    def _is_unsafe(self, node: ast.stmt) -> bool:
+    @staticmethod
+    def _is_unsafe(node: ast.stmt) -> bool:
         """
         Remove unsafe code from the code to prevent malicious code execution.
 
@@ -265,7 +302,7 @@ Code running:
         Returns (bool):
         """
 
-        code = astor.to_source(node)
+        code = ast.unparse(node)
         if any(
             method in code
             for method in [
@@ -291,19 +328,18 @@ Code running:
 
         return False
 
-    def _sanitize_analyze_data(self, analyze_data_node: ast.stmt) -> ast.stmt:
-        # Sanitize the code within analyze_data
-        sanitized_analyze_data = []
-        for node in analyze_data_node.body:
-            if (
-                self._is_df_overwrite(node)
-                or self._is_jailbreak(node)
-                or self._is_unsafe(node)
-            ):
-                continue
-            sanitized_analyze_data.append(node)
-
-        analyze_data_node.body = sanitized_analyze_data
+    @staticmethod
+    def _sanitize_analyze_data(analyze_data_node: ast.stmt) -> ast.stmt:
+        # Sanitize the code within analyze_data, filtering its body in place
+        analyze_data_node.body[:] = [
+            node
+            for node in analyze_data_node.body
+            if not (
+                CodeManager._is_df_overwrite(node)
+                or CodeManager._is_jailbreak(node)
+                or CodeManager._is_unsafe(node)
+            )
+        ]
         return analyze_data_node
 
     def _clean_code(self, code: str) -> str:
@@ -318,28 +354,58 @@ Code running:
 
         """
 
-        # Clear recent optional dependencies
-        self._additional_dependencies = []
+        clean_code, additional_dependencies = self._clean_code_cached(
+            code, tuple(self._config.custom_whitelisted_dependencies)
+        )
+
+        # Replace recent optional dependencies with the ones of this code
+        self._additional_dependencies = [dict(dep) for dep in additional_dependencies]
+
+        return clean_code
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _clean_code_cached(
+        code: str, custom_whitelisted_dependencies: Tuple[str, ...]
+    ) -> Tuple[str, tuple]:
+        """
+        Clean the code and collect its whitelisted imports. The result is
+        memoized, as the LLM (or the cache) often returns the very same code.
+
+        Args:
+            code (str): A python code.
+            custom_whitelisted_dependencies (Tuple[str, ...]): Custom libraries
+                allowed to be imported on top of the whitelisted ones.
+
+        Returns:
+            Tuple[str, tuple]: The clean code string and the additional
+                dependencies, each one as a tuple of key/value pairs.
+        """
 
         tree = ast.parse(code)
+        whitelisted_libraries = _WHITELISTED_LIBRARIES.union(
+            custom_whitelisted_dependencies
+        )
 
-        # Check for imports and the node where analyze_data is defined
-        new_body = []
+        # Check for imports and sanitize the node where analyze_data is defined
+        additional_dependencies = []
         for node in tree.body:
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                self._check_imports(node)
-                continue
-            if isinstance(node, ast.FunctionDef) and node.name == "analyze_data":
-                analyze_data_node = node
-                sanitized_analyze_data = self._sanitize_analyze_data(analyze_data_node)
-                new_body.append(sanitized_analyze_data)
-                continue
-            new_body.append(node)
-
-        new_tree = ast.Module(body=new_body)
-        return astor.to_source(new_tree, pretty_source=lambda x: "".join(x)).strip()
-
-    def _is_df_overwrite(self, node: ast.stmt) -> bool:
+            node_type = type(node)
+            if node_type in _IMPORT_TYPES:
+                additional_dependencies.extend(
+                    CodeManager._check_imports(node, whitelisted_libraries)
+                )
+            elif node_type is ast.FunctionDef and node.name == "analyze_data":
+                CodeManager._sanitize_analyze_data(node)
+
+        # Drop the imports in place, the dependencies are added to the environment
+        tree.body[:] = [node for node in tree.body if type(node) not in _IMPORT_TYPES]
+        clean_code = ast.unparse(tree).strip()
+
+        return clean_code, tuple(tuple(dep.items()) for dep in additional_dependencies)
+
+    @staticmethod
+    def _is_df_overwrite(node: ast.stmt) -> bool:
         """
         Remove df declarations from the code to prevent malicious code execution.
 
@@ -351,23 +417,32 @@ Code running:
         """
 
         return (
-            isinstance(node, ast.Assign)
-            and isinstance(node.targets[0], ast.Name)
+            type(node) is ast.Assign
+            and type(node.targets[0]) is ast.Name
             and node.targets[0].id == "dfs"
         )
 
-    def _check_imports(self, node: Union[ast.Import, ast.ImportFrom]):
+    @staticmethod
+    def _check_imports(
+        node: Union[ast.Import, ast.ImportFrom],
+        whitelisted_libraries: FrozenSet[str] = _WHITELISTED_LIBRARIES,
+    ) -> List[dict]:
         """
-        Add whitelisted imports to _additional_dependencies.
+        Get the additional dependencies required by a whitelisted import.
 
         Args:
             node (object): ast.Import or ast.ImportFrom
+            whitelisted_libraries (FrozenSet[str]): Libraries allowed to be
+                imported, including the custom whitelisted dependencies.
 
         Raises:
             BadImportError: If the import is not whitelisted
 
+        Returns:
+            List[dict]: The dependencies to be added to the environment.
+
         """
-        if isinstance(node, ast.Import):
+        if type(node) is ast.Import:
             module = node.names[0].name
         else:
             module = node.module
@@ -375,25 +450,23 @@ Code running:
         library = module.split(".")[0]
 
         if library == "pandas":
-            return
-
-        if (
-            library
-            in WHITELISTED_LIBRARIES + self._config.custom_whitelisted_dependencies
-        ):
-            for alias in node.names:
-                self._additional_dependencies.append(
-                    {
-                        "module": module,
-                        "name": alias.name,
-                        "alias": alias.asname or alias.name,
-                    }
-                )
-            return
+            return []
+
+        if library in whitelisted_libraries:
+            return [
+                {
+                    "module": module,
+                    "name": alias.name,
+                    "alias": alias.asname or alias.name,
+                }
+                for alias in node.names
+            ]
 
-        if library not in WHITELISTED_BUILTINS:
+        if library not in _WHITELISTED_BUILTINS:
             raise BadImportError(library)
 
+        return []
+
     @property
     def middlewares(self):
         return self._middlewares
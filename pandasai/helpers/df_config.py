@@ -35,6 +35,20 @@ class Config(BaseModel):
 
 
 def load_config(override_config: Config = None):
+    # An already validated config is reused as is, skipping the config file and
+    # the validation. It is copied so that updating it doesn't affect the original:
+    # the copy is shallow (to share the llm), so the mutable fields are copied too
+    if isinstance(override_config, Config):
+        return override_config.copy(
+            update={
+                "custom_prompts": dict(override_config.custom_prompts),
+                "custom_whitelisted_dependencies": list(
+                    override_config.custom_whitelisted_dependencies
+                ),
+                "middlewares": list(override_config.middlewares),
+            }
+        )
+
     config = {}
 
     if override_config is None:
@@ -33,9 +33,8 @@ class Prompt:
                 description += f"{df.name} (dfs[{index-1}])"
             else:
                 description += f"dfs[{index-1}]"
-            description += (
-                f", with {df.rows_count} rows and {df.columns_count} columns."
-            )
+            rows_count, columns_count = df.shape
+            description += f", with {rows_count} rows and {columns_count} columns."
             if df.description is not None:
                 description += f"\nDescription: {df.description}"
             description += f"""
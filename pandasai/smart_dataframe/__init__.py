@@ -43,6 +43,7 @@ class SmartDataframe(DataframeAbstract, Shortcuts):
     _df: pd.DataFrame
     _dl: SmartDatalake
     _sample_head: str = None
+    _sample_head_key: tuple = None
 
     def __init__(
         self,
@@ -123,16 +124,14 @@ class SmartDataframe(DataframeAbstract, Shortcuts):
             )
 
     def __getattr__(self, name):
-        if name in self.__dict__:
-            return self.__dict__[name]
-        elif name in dir(SmartDataframe):
-            return object.__getattribute__(self, name)
-        elif hasattr(self._df, name):
-            return getattr(self._df, name)
-        else:
+        # Only called when the regular lookup fails, so the attribute is
+        # forwarded straight to the underlying dataframe
+        try:
+            return getattr(self.__dict__["_df"], name)
+        except (KeyError, AttributeError):
             raise AttributeError(
                 f"'{name}' is not a valid attribute for SmartDataframe"
-            )
+            ) from None
 
     def __dir__(self):
         return dir(self._df)
@@ -180,15 +179,24 @@ class SmartDataframe(DataframeAbstract, Shortcuts):
         Returns:
             str: CSV string
         """
-        if self._sample_head is not None:
-            return self._sample_head
-
         rows_to_display = 0 if self._dl.config.enforce_privacy else 5
 
-        sample = DataSampler(self._df)
-        df_head = sample.sample(rows_to_display)
+        # The sample is computed once and reused until the dataframe is
+        # replaced or reshaped, or the number of rows to display changes
+        sample_head_key = (id(self._df), self._df.shape, rows_to_display)
+        if self._sample_head is not None and self._sample_head_key == sample_head_key:
+            return self._sample_head
+
+        if rows_to_display == 0:
+            # Only the header is shared, no need to sample (and anonymize)
+            # the values, nor to convert a polars dataframe to pandas
+            df_head = pd.DataFrame(columns=self._df.columns)
+        else:
+            sample = DataSampler(self._df)
+            df_head = sample.sample(rows_to_display)
 
         self._sample_head = df_head.to_csv(index=False)
+        self._sample_head_key = sample_head_key
         return self._sample_head
 
     @property
@@ -203,6 +211,18 @@ class SmartDataframe(DataframeAbstract, Shortcuts):
     def columns_count(self):
         return self._df.shape[1]
 
+    @property
+    def shape(self):
+        return self._df.shape
+
+    @property
+    def columns(self):
+        return self._df.columns
+
+    @property
+    def dtypes(self):
+        return self._df.dtypes
+
     @property
     def head_csv(self):
         return self._get_head_csv()
@@ -40,6 +40,27 @@ from ..middlewares.base import Middleware
 from ..helpers.df_info import DataFrameType, polars_imported
 from ..helpers.path import find_project_root
 
+_matplotlib = None
+
+
+def _get_matplotlib():
+    """
+    Import matplotlib the first time a plot is displayed and keep a reference
+    to the modules for the following plots.
+
+    Returns:
+        tuple: The `matplotlib.pyplot` and `matplotlib.image` modules
+    """
+    global _matplotlib
+
+    if _matplotlib is None:
+        import matplotlib.pyplot as plt
+        import matplotlib.image as mpimg
+
+        _matplotlib = (plt, mpimg)
+
+    return _matplotlib
+
 
 class SmartDatalake:
     _dfs: List[DataFrameType]
@@ -250,14 +271,20 @@ class SmartDatalake:
         self._memory.add(query, True)
 
         try:
-            if (
-                self._config.enable_cache
-                and self._cache
-                and self._cache.get(self._get_cache_key())
-            ):
+            cached_code = Cache.MISSING
+            if self._config.enable_cache and self._cache:
+                cache_key = self._get_cache_key()
+                cached_code = self._cache.get(cache_key, Cache.MISSING)
+
+            # Only a non-empty code is reused, an invalid entry (e.g. cached from
+            # a bad reply of the LLM) is generated again and overwritten
+            if isinstance(cached_code, str) and cached_code.strip():
                 self._logger.log("Using cached response")
-                code = self._cache.get(self._get_cache_key())
+                code = cached_code
             else:
+                if cached_code is not Cache.MISSING:
+                    self._logger.log("Ignoring invalid cached response")
+
                 default_values = {
                     # TODO: find a better way to determine the engine,
                     "engine": self._dfs[0].engine,
@@ -271,7 +298,7 @@ class SmartDatalake:
                 code = self._llm.generate_code(generate_python_code_instruction)
 
                 if self._config.enable_cache and self._cache:
-                    self._cache.set(self._get_cache_key(), code)
+                    self._cache.set(cache_key, code)
 
             if self._config.callback is not None:
                 self._config.callback.on_code(code)
@@ -293,6 +320,7 @@ class SmartDatalake:
             retry_count = 0
             code_to_run = code
             result = None
+            error_correcting_instruction = None
             while retry_count < self._config.max_retries:
                 try:
                     # Execute the code
@@ -316,7 +344,17 @@ class SmartDatalake:
                         level=logging.WARNING,
                     )
 
-                    code_to_run = self._retry_run_code(code, e)
+                    # The dataframes metadata and the conversation don't change
+                    # between the retries of the same question, so the prompt is
+                    # only built on the first retry
+                    if error_correcting_instruction is None:
+                        error_correcting_instruction = (
+                            self._get_error_correcting_instruction()
+                        )
+
+                    code_to_run = self._retry_run_code(
+                        code_to_run, e, error_correcting_instruction
+                    )
 
             if result is not None:
                 self.last_result = result
@@ -362,12 +400,11 @@ class SmartDatalake:
 
             return SmartDataframe(
                 df,
-                config=self._config.__dict__,
+                config=self._config,
                 logger=self._logger,
             )
         elif result["type"] == "plot":
-            import matplotlib.pyplot as plt
-            import matplotlib.image as mpimg
+            plt, mpimg = _get_matplotlib()
 
             # Load the image file
             image = mpimg.imread(result["value"])
@@ -380,33 +417,52 @@ class SmartDatalake:
         else:
             return result["value"]
 
-    def _retry_run_code(self, code: str, e: Exception):
+    def _get_error_correcting_instruction(self) -> Prompt:
+        """
+        Build the prompt used to correct the code, without the failed code and
+        the error returned, which are set on each retry.
+
+        Returns (Prompt): The error correcting prompt
+        """
+
+        # TODO: find a better way to determine these values
+        num_rows, num_columns = self._dfs[0].shape
+        default_values = {
+            "df_head": self._dfs[0].head_csv,
+            "num_rows": num_rows,
+            "num_columns": num_columns,
+        }
+        return self._get_prompt(
+            "correct_error",
+            default_prompt=CorrectErrorPrompt,
+            default_values=default_values,
+        )
+
+    def _retry_run_code(
+        self,
+        code: str,
+        e: Exception,
+        error_correcting_instruction: Optional[Prompt] = None,
+    ):
         """
         A method to retry the code execution with error correction framework.
 
         Args:
             code (str): A python code
             e (Exception): An exception
-            dataframes
+            error_correcting_instruction (Prompt, optional): The prompt built for
+                the previous retries of the same question. Defaults to None.
 
         Returns (str): A python code
         """
 
         self._logger.log(f"Failed with error: {e}. Retrying")
 
-        default_values = {
-            "code": code,
-            "error_returned": e,
-            # TODO: find a better way to determine these values
-            "df_head": self._dfs[0].head_csv,
-            "num_rows": self._dfs[0].rows_count,
-            "num_columns": self._dfs[0].columns_count,
-        }
-        error_correcting_instruction = self._get_prompt(
-            "correct_error",
-            default_prompt=CorrectErrorPrompt,
-            default_values=default_values,
-        )
+        if error_correcting_instruction is None:
+            error_correcting_instruction = self._get_error_correcting_instruction()
+
+        error_correcting_instruction.set_var("code", code)
+        error_correcting_instruction.set_var("error_returned", e)
 
         code = self._llm.generate_code(error_correcting_instruction)
         if self._config.callback is not None:
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 
-@pytest.fixture(scope="session")
+@pytest.fixture
 def mock_json_load():
     mock = MagicMock()
 
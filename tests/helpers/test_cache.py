@@ -26,3 +26,13 @@ class TestCache:
         assert cache.get("key") == "value"
 
         cache.destroy()
+
+    def test_get_missing_key_with_sentinel(self):
+        cache_filename = f"cache_{uuid.uuid4().hex}"
+        cache = Cache(filename=cache_filename)
+        assert cache.get("key", Cache.MISSING) is Cache.MISSING
+
+        cache.set("key", "")
+        assert cache.get("key", Cache.MISSING) == ""
+
+        cache.destroy()
@@ -0,0 +1,29 @@
+from unittest.mock import Mock, patch
+
+from pandasai.helpers.df_config import Config, load_config
+from pandasai.llm.fake import FakeLLM
+
+
+class TestDfConfig:
+    def test_load_config_with_config_instance(self):
+        config = Config(llm=FakeLLM())
+
+        with patch("pandasai.helpers.df_config.find_closest") as mock_find_closest:
+            loaded_config = load_config(config)
+
+        mock_find_closest.assert_not_called()
+        assert loaded_config is not config
+        assert loaded_config == config
+        assert loaded_config.llm is config.llm
+
+    def test_load_config_copies_mutable_fields(self):
+        config = Config(llm=FakeLLM())
+        loaded_config = load_config(config)
+
+        loaded_config.custom_prompts["correct_error"] = Mock()
+        loaded_config.custom_whitelisted_dependencies.append("seaborn")
+        loaded_config.middlewares.append(Mock())
+
+        assert config.custom_prompts == {}
+        assert config.custom_whitelisted_dependencies == []
+        assert config.middlewares == []
@@ -78,10 +78,33 @@ class TestCodeManager:
         assert code_manager.execute_code(code, "")["value"] == 2
         assert code_manager.last_code_executed == code
 
+    def test_middlewares_are_not_shared(self, code_manager: CodeManager, sample_df):
+        other_code_manager = CodeManager(
+            dfs=[sample_df],
+            config=code_manager._config,
+            logger=code_manager._logger,
+        )
+        middlewares = list(code_manager.middlewares)
+        other_code_manager.add_middlewares(Mock())
+
+        assert code_manager.middlewares == middlewares
+        assert len(other_code_manager.middlewares) == len(middlewares) + 1
+
     def test_run_code_invalid_code(self, code_manager: CodeManager):
         with pytest.raises(Exception):
             code_manager.execute_code("1+ ", "")
 
+    def test_run_code_with_nested_import(self, code_manager: CodeManager):
+        code = """def analyze_data(dfs):
+    import numpy as np
+    return {'type': 'number', 'value': 1}"""
+
+        exc = code_manager._execute_catching_errors(
+            code, code_manager._get_environment()
+        )
+        assert isinstance(exc, ImportError)
+        assert str(exc) == "__import__ not found"
+
     def test_clean_code_remove_builtins(self, code_manager: CodeManager):
         builtins_code = """import set
 def analyze_data(dfs):
@@ -117,6 +140,22 @@ np.array()
 """
         assert code_manager._clean_code(safe_code) == "np.array()"
 
+    def test_clean_code_cached_restores_dependencies(self, code_manager: CodeManager):
+        safe_code = """
+import numpy as np
+np.array()
+"""
+        code_manager._clean_code(safe_code)
+        code_manager._clean_code("print('hello world')")
+        assert code_manager._additional_dependencies == []
+
+        hits = CodeManager._clean_code_cached.cache_info().hits
+        assert code_manager._clean_code(safe_code) == "np.array()"
+        assert CodeManager._clean_code_cached.cache_info().hits == hits + 1
+        assert code_manager._additional_dependencies == [
+            {"module": "numpy", "name": "numpy", "alias": "np"}
+        ]
+
     def test_clean_code_raise_bad_import_error(self, code_manager: CodeManager):
         malicious_code = """
 import os
@@ -244,6 +283,21 @@ def analyze_data(dfs: list):
             "__name__": "__main__",
         }
 
+    def test_get_environment_imports_dependencies_once(self, code_manager: CodeManager):
+        code_manager._additional_dependencies = [
+            {"name": "pyplot", "alias": "plt", "module": "matplotlib"},
+            {"name": "numpy", "alias": "np", "module": "numpy"},
+        ]
+
+        with patch(
+            "pandasai.helpers.code_manager.import_dependency",
+            side_effect=lambda name: __import__(name),
+        ) as mock_import:
+            code_manager._get_environment()
+            code_manager._get_environment()
+
+        assert mock_import.call_count == 2
+
     def test_execute_catching_errors_correct(self, code_manager: CodeManager):
         code = """def analyze_data(dfs):
     return {'type': 'number', 'value': 1 + 1}"""
@@ -252,7 +306,8 @@ def analyze_data(dfs: list):
         with patch("builtins.exec") as mock_exec:
             assert code_manager._execute_catching_errors(code, environment) is None
             mock_exec.assert_called_once_with(
-                code + "\n\nresult = analyze_data(dfs)", environment
+                compile(code + "\n\nresult = analyze_data(dfs)", "<string>", "exec"),
+                environment,
             )
 
     def test_execute_catching_errors_raise_exc(self, code_manager: CodeManager):
@@ -264,7 +319,8 @@ def analyze_data(dfs: list):
             mock_exec.side_effect = RuntimeError("foobar")
             exc = code_manager._execute_catching_errors(code, environment)
             mock_exec.assert_called_once_with(
-                code + "\n\nresult = analyze_data(dfs)", environment
+                compile(code + "\n\nresult = analyze_data(dfs)", "<string>", "exec"),
+                environment,
             )
             assert isinstance(exc, RuntimeError)
 
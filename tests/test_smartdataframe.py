@@ -176,6 +176,26 @@ Updated code:
             last_prompt = df.last_prompt.replace("\r\n", "\n")
         assert last_prompt == expected_prompt
 
+    def test_head_csv_is_cached(self, smart_dataframe: SmartDataframe):
+        with patch(
+            "pandasai.smart_dataframe.DataSampler.sample",
+            return_value=pd.DataFrame({"country": ["France"]}),
+        ) as mock_sample:
+            assert smart_dataframe.head_csv == "country\nFrance\n"
+            assert smart_dataframe.head_csv == "country\nFrance\n"
+            mock_sample.assert_called_once_with(5)
+
+            smart_dataframe["population"] = 0
+            smart_dataframe.head_csv
+            assert mock_sample.call_count == 2
+
+    def test_head_csv_with_privacy_enforcement(self, smart_dataframe: SmartDataframe):
+        smart_dataframe.enforce_privacy = True
+
+        with patch("pandasai.smart_dataframe.DataSampler") as mock_sampler:
+            assert smart_dataframe.head_csv == "country,gdp,happiness_index\n"
+            mock_sampler.assert_not_called()
+
     def test_extract_code(self, llm):
         code = """```python
 result = {'happiness': 0.5, 'gdp': 0.8}
@@ -208,6 +228,17 @@ result = {'happiness': 1, 'gdp': 0.43}```"""
             == "def analyze_data(dfs):\n    return {'type': 'number', 'value': 1}"
         )
 
+    def test_forwards_attributes_to_dataframe(
+        self, smart_dataframe: SmartDataframe, sample_df
+    ):
+        assert smart_dataframe.shape == (10, 3)
+        assert smart_dataframe.columns.tolist() == sample_df.columns.tolist()
+        assert smart_dataframe.dtypes.equals(sample_df.dtypes)
+        assert smart_dataframe.ndim == 2
+
+        with pytest.raises(AttributeError):
+            smart_dataframe.not_an_attribute
+
     def test_add_middlewares(self, smart_dataframe: SmartDataframe, custom_middleware):
         middleware = custom_middleware()
         smart_dataframe.add_middlewares(middleware)
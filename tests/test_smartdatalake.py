@@ -115,6 +115,41 @@ class TestSmartDatalake:
             "value": "There are 10 countries in the dataframe.",
         }
 
+    def test_cached_code_is_read_once(self, smart_datalake: SmartDatalake, llm):
+        cached_code = """def analyze_data(dfs):
+    return { 'type': 'number', 'value': 1 }"""
+        smart_datalake._config.enable_cache = True
+        smart_datalake._cache = Mock()
+        smart_datalake._cache.get.return_value = cached_code
+        smart_datalake._code_manager.execute_code = Mock(
+            return_value={"type": "number", "value": 1}
+        )
+        llm.generate_code = Mock()
+
+        assert smart_datalake.chat("What number comes before 2?") == 1
+        smart_datalake._cache.get.assert_called_once()
+        llm.generate_code.assert_not_called()
+        smart_datalake._code_manager.execute_code.assert_called_once_with(
+            code=cached_code, prompt_id=smart_datalake.last_prompt_id
+        )
+
+    @pytest.mark.parametrize("cached_code", ["", None])
+    def test_invalid_cached_code_is_regenerated(
+        self, smart_datalake: SmartDatalake, llm, cached_code
+    ):
+        smart_datalake._config.enable_cache = True
+        smart_datalake._cache = Mock()
+        smart_datalake._cache.get.return_value = cached_code
+        code = """def analyze_data(dfs):
+    return { 'type': 'number', 'value': 1 }"""
+        llm.generate_code = Mock(return_value=code)
+
+        assert smart_datalake.chat("What number comes before 2?") == 1
+        llm.generate_code.assert_called_once()
+        smart_datalake._cache.set.assert_called_once_with(
+            smart_datalake._get_cache_key(), code
+        )
+
     def test_middlewares(self, smart_dataframe: SmartDataframe, custom_middleware):
         middleware = custom_middleware()
         smart_dataframe._dl._code_manager._middlewares = [middleware]
@@ -167,6 +202,54 @@ Correct the python code and return a new python code (do not import anything) th
 """  # noqa: E501
         )
 
+    def test_retry_uses_last_failed_code(self, smart_datalake: SmartDatalake):
+        first_error, second_error = Exception("first"), Exception("second")
+        smart_datalake._code_manager.execute_code = Mock(
+            side_effect=[first_error, second_error, {"type": "number", "value": 1}]
+        )
+        smart_datalake._retry_run_code = Mock(side_effect=["code 1", "code 2"])
+
+        assert smart_datalake.chat("What number comes before 2?") == 1
+        assert smart_datalake._retry_run_code.call_args_list[1].args[:2] == (
+            "code 1",
+            second_error,
+        )
+        smart_datalake._code_manager.execute_code.assert_called_with(
+            code="code 2", prompt_id=smart_datalake.last_prompt_id
+        )
+
+    def test_retry_builds_error_correcting_prompt_once_per_question(
+        self, smart_datalake: SmartDatalake, llm
+    ):
+        result = {"type": "number", "value": 1}
+        smart_datalake._code_manager.execute_code = Mock(
+            side_effect=[Exception("first"), Exception("second"), result]
+        )
+        llm.generate_code = Mock(side_effect=["code 0", "code 1", "code 2"])
+
+        with patch.object(
+            smart_datalake,
+            "_get_error_correcting_instruction",
+            wraps=smart_datalake._get_error_correcting_instruction,
+        ) as mock_get_instruction:
+            assert smart_datalake.chat("What number comes before 2?") == 1
+            mock_get_instruction.assert_called_once()
+
+            first_retry_prompt = llm.generate_code.call_args_list[1].args[0]
+            last_retry_prompt = llm.generate_code.call_args_list[2].args[0]
+            assert last_retry_prompt is first_retry_prompt
+            assert "code 1" in last_retry_prompt.to_string()
+            assert "second" in last_retry_prompt.to_string()
+
+            smart_datalake._code_manager.execute_code.side_effect = [
+                Exception("third"),
+                result,
+            ]
+            llm.generate_code.side_effect = ["code 3", "code 4"]
+
+            assert smart_datalake.chat("What number comes after 0?") == 1
+            assert mock_get_instruction.call_count == 2
+
     @patch("os.makedirs")
     def test_initialize(self, mock_makedirs, smart_datalake: SmartDatalake):
         smart_datalake.initialize()